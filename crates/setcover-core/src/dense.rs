@@ -17,22 +17,53 @@ pub(crate) struct Run {
 /// that is an error depends on where `universe_size` came from, which is the
 /// caller's business.
 pub(crate) fn greedy_picks(universe_size: usize, sets: &[Vec<usize>], track_owner: bool) -> Run {
+    greedy_picks_by(
+        universe_size,
+        sets.len(),
+        |i| sets[i].as_slice(),
+        track_owner,
+    )
+}
+
+/// As [`greedy_picks`], but over CSR storage: `elements[offsets[i]..offsets[i + 1]]`
+/// is set i. `offsets` must be well-formed (see [`greedy_set_cover_csr`]);
+/// malformed offsets panic on the slice.
+pub(crate) fn greedy_picks_csr(
+    universe_size: usize,
+    offsets: &[usize],
+    elements: &[usize],
+    track_owner: bool,
+) -> Run {
+    let n_sets = offsets.len().saturating_sub(1);
+    greedy_picks_by(
+        universe_size,
+        n_sets,
+        |i| &elements[offsets[i]..offsets[i + 1]],
+        track_owner,
+    )
+}
+
+/// The greedy loop itself, generic over how set i is stored.
+fn greedy_picks_by<'a, F>(universe_size: usize, n_sets: usize, set: F, track_owner: bool) -> Run
+where
+    F: Fn(usize) -> &'a [usize],
+{
     let mut uncovered = vec![true; universe_size];
     let mut owner = track_owner.then(|| vec![usize::MAX; universe_size]);
     let mut remaining = universe_size;
     let mut chosen_sets = Vec::new();
-    let mut used = vec![false; sets.len()];
+    let mut used = vec![false; n_sets];
 
     while remaining > 0 {
         let mut best_idx: Option<usize> = None;
         let mut best_cover = 0usize;
 
-        for (i, s) in sets.iter().enumerate() {
-            if used[i] {
+        for (i, &is_used) in used.iter().enumerate() {
+            if is_used {
                 continue;
             }
             let mut cover = 0usize;
-            for &e in s {
+            for &e in set(i) {
                 if e < universe_size && uncovered[e] {
                     cover += 1;
                 }
@@ -54,7 +85,7 @@ pub(crate) fn greedy_picks(universe_size: usize, sets: &[Vec<usize>], track_owne
         // Count while marking rather than trusting `best_cover`: the scan above
         // counts a duplicated element once per occurrence, this cannot.
         let mut n_new = 0usize;
-        for &e in &sets[idx] {
+        for &e in set(idx) {
             if e < universe_size && uncovered[e] {
                 uncovered[e] = false;
                 if let Some(owner) = owner.as_mut() {
@@ -114,6 +145,41 @@ pub fn greedy_set_cover_dense_with_owner(
     }
 }
 
+/// As [`greedy_set_cover_dense`], but over CSR storage.
+///
+/// Set i is `elements[offsets[i]..offsets[i + 1]]`, so the whole input is two
+/// contiguous buffers instead of one allocation per set — the layout the
+/// Python bindings hand over directly from a flat column. `offsets` must be
+/// non-decreasing, start at 0 and end at `elements.len()`; out-of-range
+/// offsets panic.
+pub fn greedy_set_cover_csr(
+    universe_size: usize,
+    offsets: &[usize],
+    elements: &[usize],
+) -> Option<Vec<Pick>> {
+    let run = greedy_picks_csr(universe_size, offsets, elements, false);
+    if run.remaining == 0 {
+        Some(run.picks)
+    } else {
+        None
+    }
+}
+
+/// As [`greedy_set_cover_csr`], plus the element-to-set assignment of
+/// [`greedy_set_cover_dense_with_owner`].
+pub fn greedy_set_cover_csr_with_owner(
+    universe_size: usize,
+    offsets: &[usize],
+    elements: &[usize],
+) -> Option<(Vec<Pick>, Vec<usize>)> {
+    let run = greedy_picks_csr(universe_size, offsets, elements, true);
+    if run.remaining == 0 {
+        Some((run.picks, run.owner.expect("requested above")))
+    } else {
+        None
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -159,4 +225,31 @@ mod tests {
         let picks = greedy_set_cover_dense(2, &[vec![0, 9], vec![1]]).unwrap();
         assert_eq!(picks.iter().map(|p| p.n_new).sum::<usize>(), 2);
     }
+
+    #[test]
+    fn csr_agrees_with_the_vec_of_vecs_solver() {
+        // Same sets as the owner test above: {0,1,2} and {2,3}.
+        let sets = vec![vec![0, 1, 2], vec![2, 3]];
+        let offsets = [0, 3, 5];
+        let elements = [0, 1, 2, 2, 3];
+
+        assert_eq!(
+            greedy_set_cover_csr(4, &offsets, &elements),
+            greedy_set_cover_dense(4, &sets)
+        );
+        assert_eq!(
+            greedy_set_cover_csr_with_owner(4, &offsets, &elements),
+            greedy_set_cover_dense_with_owner(4, &sets)
+        );
+    }
+
+    #[test]
+    fn csr_handles_empty_input_and_uncoverable_universes() {
+        // offsets of a single 0 means zero sets.
+        assert_eq!(greedy_set_cover_csr(0, &[0], &[]), Some(Vec::new()));
+        assert_eq!(greedy_set_cover_csr(1, &[0], &[]), None);
+        // An empty set in the middle is skipped like its Vec counterpart.
+        let picks = greedy_set_cover_csr(2, &[0, 1, 1, 2], &[0, 1]).unwrap();
+        assert_eq!(picks.len(), 2);
+    }
 }
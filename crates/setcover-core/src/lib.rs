@@ -1,7 +1,10 @@
 mod dense;
 mod mapping;
 
-pub use dense::{greedy_set_cover_dense, greedy_set_cover_dense_with_owner};
+pub use dense::{
+    greedy_set_cover_csr, greedy_set_cover_csr_with_owner, greedy_set_cover_dense,
+    greedy_set_cover_dense_with_owner,
+};
 pub use mapping::compress_universe;
 
 use std::collections::HashMap;
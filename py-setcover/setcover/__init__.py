@@ -1,15 +1,30 @@
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Mapping, Sequence
 from itertools import accumulate
 from typing import Any, Literal, NamedTuple
 
 import narwhals as nw
+import numpy as np
 from narwhals.typing import IntoFrame
 
 from setcover._setcover_lib import (
+    greedy_set_cover_dense_csr_py,
+    greedy_set_cover_dense_csr_with_owner_py,
     greedy_set_cover_dense_py,
     greedy_set_cover_dense_with_owner_py,
 )
 
+# Resolved once at import time: output mode -> solver binding. One dict lookup
+# per call replaces re-deciding the binding inside each path, and membership
+# doubles as the validation of `output`.
+_CSR_SOLVERS = {
+    "sets": greedy_set_cover_dense_csr_py,
+    "pairs": greedy_set_cover_dense_csr_with_owner_py,
+}
+_LIST_SOLVERS = {
+    "sets": greedy_set_cover_dense_py,
+    "pairs": greedy_set_cover_dense_with_owner_py,
+}
+
 
 class Step(NamedTuple):
     """One greedy selection, in the order the solver made it."""
@@ -28,11 +43,28 @@ def map_to_ints(df_native: IntoFrame, set_col: str, el_col: str) -> nw.DataFrame
     `element`, `element_int` — so callers can map results back.
 
     The mapping is generated via dense ranking so that each unique value maps to
-    a stable integer in the range [0, n-1].
+    a stable integer in the range [0, n-1]. Columns that already hold exactly
+    the ids 0..n-1 are passed through as-is, which skips the rank's sort — the
+    common case when callers pre-encode their ids.
     This will drop missing values and duplicate (set, element) pairs silently.
     Duplicates must go: the solver scores a candidate set by counting its
     elements, so a repeated pair would inflate that set's apparent gain.
     """
+    mapped, _ = _map_to_ints_sized(df_native, set_col, el_col)
+    return mapped
+
+
+def _map_to_ints_sized(
+    df_native: IntoFrame, set_col: str, el_col: str
+) -> tuple[nw.DataFrame, int]:
+    """
+    As `map_to_ints`, plus the universe size (the element count).
+
+    element_int is a dense rank, so the universe size is its n_unique — known
+    while the column is still hot here, which saves the caller a second full
+    scan to recover it via max() + 1 (and the None/NaN dance an empty frame
+    makes of that max).
+    """
     df = nw.from_native(df_native, eager_only=True)
     sets = nw.col(set_col)
     elements = nw.col(el_col)
@@ -41,18 +73,147 @@ def map_to_ints(df_native: IntoFrame, set_col: str, el_col: str) -> nw.DataFrame
         ranked = expr.rank(method="dense") - 1
         return ranked.cast(nw.Int64)
 
-    return (
-        df.select(set_col, el_col)
-        .drop_nulls()
-        .unique([set_col, el_col])
-        .select(
-            sets.alias("set"),
-            _dense_rank_expr(sets).alias("set_int"),
-            elements.alias("element"),
-            _dense_rank_expr(elements).alias("element_int"),
-        )
+    base = df.select(set_col, el_col).drop_nulls().unique([set_col, el_col])
+
+    if df.implementation.is_pandas():
+        return _factorize_pandas(base, set_col, el_col)
+
+    int_stats = _integer_stats(base, set_col, el_col)
+
+    def _id_expr(expr: nw.Expr, col: str) -> nw.Expr:
+        stats = int_stats.get(col)
+        # mn/mx are None on an empty frame, which correctly fails the check.
+        if stats is not None and stats[0] == 0 and stats[1] + 1 == stats[2]:
+            # Already the dense ids 0..n-1: ranking is the identity, so skip
+            # the sort it costs.
+            return expr.cast(nw.Int64)
+        return _dense_rank_expr(expr)
+
+    mapped = base.select(
+        sets.alias("set"),
+        _id_expr(sets, set_col).alias("set_int"),
+        elements.alias("element"),
+        _id_expr(elements, el_col).alias("element_int"),
     )
 
+    if el_col in int_stats:
+        universe_size = int_stats[el_col][2]
+    else:
+        universe_size = base.select(nw.col(el_col).n_unique()).item()
+    return mapped, int(universe_size)
+
+
+def _factorize_pandas(
+    base: nw.DataFrame, set_col: str, el_col: str
+) -> tuple[nw.DataFrame, int]:
+    """
+    The pandas body of `_map_to_ints_sized`.
+
+    pd.factorize is a single hash pass per column, where the generic
+    rank(method="dense") goes through pandas' much slower sort-based rank.
+    sort=True keeps the ids value-ordered, so the solver's tie-breaking is
+    identical to the rank path, and the element uniques hand over the universe
+    size for free.
+    """
+    import pandas as pd
+
+    native = base.to_native()
+    set_codes, _ = pd.factorize(native[set_col], sort=True)
+    el_codes, el_uniques = pd.factorize(native[el_col], sort=True)
+
+    mapped = pd.DataFrame(
+        {
+            "set": native[set_col].to_numpy(),
+            "set_int": set_codes,
+            "element": native[el_col].to_numpy(),
+            "element_int": el_codes,
+        }
+    )
+    return nw.from_native(mapped, eager_only=True), len(el_uniques)
+
+
+def _integer_stats(base: nw.DataFrame, *cols: str) -> dict[str, tuple[Any, Any, int]]:
+    """
+    (min, max, n_unique) per integer column of `base`, in one pass.
+
+    The stats for every integer column go through a single `select`, so
+    deciding whether a column already holds dense ids costs one scan versus
+    the full sort a dense rank would spend on it.
+    """
+    candidates = [c for c in cols if base.schema[c].is_integer()]
+    if not candidates:
+        return {}
+
+    stats = base.select(
+        *(
+            expr
+            for i, c in enumerate(candidates)
+            for expr in (
+                nw.col(c).min().alias(f"min_{i}"),
+                nw.col(c).max().alias(f"max_{i}"),
+                nw.col(c).n_unique().alias(f"nu_{i}"),
+            )
+        )
+    ).row(0)
+
+    return {c: tuple(stats[3 * i : 3 * i + 3]) for i, c in enumerate(candidates)}
+
+
+def _owner_order(picks, owner: list[int], universe_size: int) -> list[int]:
+    """
+    Element ids in output order for "pairs": by owning pick, then by id.
+
+    `owner` maps each element to the set that first covered it. Bucketing the
+    elements by their pick's step and walking ids in ascending order gives the
+    same (step, element) order a global sort would, as one O(n) gather by
+    integer index instead of an O(n log n) sort through a Python key.
+    """
+    step_of_set = {set_idx: step for step, (set_idx, _) in enumerate(picks)}
+    buckets: list[list[int]] = [[] for _ in picks]
+    for e in range(universe_size):
+        buckets[step_of_set[owner[e]]].append(e)
+    return [e for bucket in buckets for e in bucket]
+
+
+def _steps_from_picks(picks, labels) -> list[Step]:
+    """Expand solver (set_index, n_new) pairs into Step tuples."""
+    cumulative = accumulate(gain for _, gain in picks)
+    return [
+        Step(set=labels[idx], step=step, n_new=gain, n_cum=n_cum)
+        for step, ((idx, gain), n_cum) in enumerate(zip(picks, cumulative))
+    ]
+
+
+def setcover_dense(
+    universe_size: int,
+    sets: Sequence[Sequence[int]] | np.ndarray,
+    offsets: np.ndarray | None = None,
+) -> list[Step]:
+    """
+    Greedy set cover over a pre-encoded dense universe {0, ..., universe_size - 1}.
+
+    The fast lane past `setcover`: no id mapping, no label bookkeeping — the
+    input goes to the solver as-is, so use this when the data is already
+    integer-encoded. `sets` is a sequence of element sequences, or, together
+    with `offsets`, a flat element array in CSR layout where set i is
+    `sets[offsets[i]:offsets[i + 1]]`.
+
+    Returns `Step` tuples in greedy selection order whose `set` is the index
+    of the chosen set in the input. Raises ValueError when the sets do not
+    span the universe.
+    """
+    if offsets is None:
+        arrays = [np.asarray(s, dtype=np.int64) for s in sets]
+        lengths = np.array([a.size for a in arrays], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        flat = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    else:
+        flat = np.ascontiguousarray(sets, dtype=np.int64)
+        offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+
+    picks = greedy_set_cover_dense_csr_py(universe_size, offsets, flat)
+    return _steps_from_picks(picks, range(len(offsets) - 1))
+
 
 def setcover(
     data: IntoFrame | Mapping[Any, Iterable[Any]],
@@ -83,39 +244,45 @@ def setcover(
       returns. Each element appears exactly once, attributed to whichever
       chosen set reached it first, so it is a partition of the universe rather
       than a join. A native DataFrame, or a list of tuples.
+
+    Input that is already dense integers can skip the mapping machinery
+    entirely via `setcover_dense`.
     """
-    if output not in ("sets", "pairs"):
+    if output not in _CSR_SOLVERS:
         raise ValueError(f"output must be 'sets' or 'pairs', got {output!r}")
+    returns_owner = output == "pairs"
 
     # DataFrame path
     if set_col is not None and el_col is not None:
-        df = map_to_ints(data, set_col, el_col).sort("set_int", "element_int")
+        mapped, universe_size = _map_to_ints_sized(data, set_col, el_col)
+        df = mapped.sort("set_int", "element_int")
         dfl = (
             df.group_by("set", "set_int")
             .agg(nw.col("element_int").len().alias("n"))
             .sort("set_int")
         )
 
-        # Build sets as list of lists. We know element_int are dense integers without nulls
-        sets = []
-        start = 0
-        elements_int = df.get_column("element_int").to_list()
-        for n in dfl.get_column("n"):
-            sets.append(elements_int[start : start + n])
-            start += n
-
-        # An empty frame — no rows, or every row dropped as null — has no max.
-        # pandas returns NaN and Polars returns None, and both blow up in the
-        # binding rather than yielding an empty cover. The universe is empty, so
-        # the solver has nothing to pick.
-        if df.shape[0]:
-            universe_size = int(df.get_column("element_int").max()) + 1
-        else:
-            universe_size = 0
-        if output == "pairs":
-            picks, owner = greedy_set_cover_dense_with_owner_py(universe_size, sets)
+        # CSR layout: set i is elements_arr[offsets[i]:offsets[i + 1]]. We know
+        # element_int are dense integers without nulls, so the whole problem
+        # crosses the FFI boundary as two flat int64 buffers — no list per set,
+        # and nothing for the binding to unbox item by item.
+        counts = dfl.get_column("n").to_numpy()
+        elements_arr = np.ascontiguousarray(
+            df.get_column("element_int").to_numpy(), dtype=np.int64
+        )
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+        if universe_size and counts.size and counts.max() == universe_size:
+            # Some candidate already covers the whole universe, so the solve is
+            # a single pick — skip the FFI round-trip. argmax returns the first
+            # maximal index, which matches the solver's tie-break.
+            best = int(np.argmax(counts))
+            picks = [(best, universe_size)]
+            owner = [best] * universe_size if returns_owner else None
+        elif returns_owner:
+            picks, owner = _CSR_SOLVERS[output](universe_size, offsets, elements_arr)
         else:
-            picks = greedy_set_cover_dense_py(universe_size, sets)
+            picks = _CSR_SOLVERS[output](universe_size, offsets, elements_arr)
 
         # dfl is sorted by set_int, and set_int is a dense rank, so row i of dfl
         # is the set the solver saw at index i.
@@ -130,10 +297,7 @@ def setcover(
                 .get_column("element")
                 .to_list()
             )
-            step_of_set = {set_idx: step for step, (set_idx, _) in enumerate(picks)}
-            order = sorted(
-                range(universe_size), key=lambda e: (step_of_set[owner[e]], e)
-            )
+            order = _owner_order(picks, owner, universe_size)
             return nw.DataFrame.from_dict(
                 {
                     "set": [labels[owner[e]] for e in order],
@@ -154,8 +318,10 @@ def setcover(
         )
         return solution.to_native()
 
-    # Mapping path (set_label -> iterable of elements)
-    if not isinstance(data, Mapping):
+    # Mapping path (set_label -> iterable of elements). The exact-type test
+    # skips the Mapping ABC's __instancecheck__ for plain dicts, the common
+    # case; anything else still gets the full protocol check.
+    if type(data) is not dict and not isinstance(data, Mapping):
         raise TypeError(
             "Unsupported input: provide a DataFrame with set_col/el_col or a mapping of set->elements"
         )
@@ -167,31 +333,32 @@ def setcover(
         if not isinstance(subset, Iterable) or isinstance(subset, (str, bytes)):
             raise TypeError("each mapping value must be an iterable of elements")
         labels.append(label)
-        ids = []
-        for el in subset:
-            if el not in elem_to_id:
-                elem_to_id[el] = len(elem_to_id)
-            ids.append(elem_to_id[el])
+        # setdefault does the membership test and the insert in one lookup;
+        # len(elem_to_id) is evaluated before the call, so a new element gets
+        # the next dense id.
+        ids = [elem_to_id.setdefault(el, len(elem_to_id)) for el in subset]
         # De-duplicate within a set while preserving insertion order
-        deduped = list(dict.fromkeys(ids))
-        sets_int.append(deduped)
+        sets_int.append(list(dict.fromkeys(ids)))
 
     universe_size = len(elem_to_id)
 
-    if output == "pairs":
-        picks, owner = greedy_set_cover_dense_with_owner_py(universe_size, sets_int)
+    best = max(range(len(sets_int)), key=lambda i: len(sets_int[i]), default=None)
+    if best is not None and universe_size and len(sets_int[best]) == universe_size:
+        # Same single-pick short-circuit as the DataFrame path; max() returns
+        # the first maximal index, matching the solver's tie-break.
+        picks = [(best, universe_size)]
+        owner = [best] * universe_size if returns_owner else None
+    elif returns_owner:
+        picks, owner = _LIST_SOLVERS[output](universe_size, sets_int)
+    else:
+        picks = _LIST_SOLVERS[output](universe_size, sets_int)
+
+    if returns_owner:
         el_labels = list(elem_to_id)  # insertion order matches the assigned ids
-        step_of_set = {set_idx: step for step, (set_idx, _) in enumerate(picks)}
-        order = sorted(range(universe_size), key=lambda e: (step_of_set[owner[e]], e))
+        order = _owner_order(picks, owner, universe_size)
         return [(labels[owner[e]], el_labels[e]) for e in order]
 
-    picks = greedy_set_cover_dense_py(universe_size, sets_int)
-
-    cumulative = accumulate(gain for _, gain in picks)
-    return [
-        Step(set=labels[idx], step=step, n_new=gain, n_cum=n_cum)
-        for step, ((idx, gain), n_cum) in enumerate(zip(picks, cumulative))
-    ]
+    return _steps_from_picks(picks, labels)
 
 
-__all__ = ["Step", "setcover"]
+__all__ = ["Step", "setcover", "setcover_dense"]
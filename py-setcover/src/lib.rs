@@ -1,7 +1,11 @@
+use numpy::PyReadonlyArray1;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 
-use setcover_core::{greedy_set_cover_dense, greedy_set_cover_dense_with_owner};
+use setcover_core::{
+    greedy_set_cover_csr, greedy_set_cover_csr_with_owner, greedy_set_cover_dense,
+    greedy_set_cover_dense_with_owner,
+};
 
 /// Returns `(set_index, n_new)` pairs in greedy selection order.
 #[pyfunction]
@@ -33,10 +37,81 @@ fn greedy_set_cover_dense_with_owner_py(
     Ok((picks.into_iter().map(|p| (p.set, p.n_new)).collect(), owner))
 }
 
+/// Read a 1-D int64 NumPy array into a `Vec<usize>`.
+///
+/// The array hands over its data directly, so there is no per-item Python
+/// object to unbox — one copy with a sign check per value.
+fn array_to_vec(arr: &PyReadonlyArray1<'_, i64>, name: &str) -> PyResult<Vec<usize>> {
+    arr.as_array()
+        .iter()
+        .map(|&v| {
+            usize::try_from(v)
+                .map_err(|_| PyValueError::new_err(format!("{name} must be non-negative")))
+        })
+        .collect()
+}
+
+/// As `greedy_set_cover_dense_py`, but over CSR storage.
+///
+/// `elements[offsets[i]:offsets[i + 1]]` is set i, so the whole problem comes
+/// in as two flat int64 arrays instead of a list per set.
+#[pyfunction]
+fn greedy_set_cover_dense_csr_py(
+    universe_size: usize,
+    offsets: PyReadonlyArray1<'_, i64>,
+    elements: PyReadonlyArray1<'_, i64>,
+) -> PyResult<Picks> {
+    let (offsets, elements) = csr_input(&offsets, &elements)?;
+    let picks = greedy_set_cover_csr(universe_size, &offsets, &elements).ok_or_else(|| {
+        PyValueError::new_err("Unable to find a set cover for the provided dataset.")
+    })?;
+    Ok(picks.into_iter().map(|p| (p.set, p.n_new)).collect())
+}
+
+/// As `greedy_set_cover_dense_csr_py`, plus the element-to-set assignment.
+#[pyfunction]
+fn greedy_set_cover_dense_csr_with_owner_py(
+    universe_size: usize,
+    offsets: PyReadonlyArray1<'_, i64>,
+    elements: PyReadonlyArray1<'_, i64>,
+) -> PyResult<(Picks, Owner)> {
+    let (offsets, elements) = csr_input(&offsets, &elements)?;
+    let (picks, owner) = greedy_set_cover_csr_with_owner(universe_size, &offsets, &elements)
+        .ok_or_else(|| {
+            PyValueError::new_err("Unable to find a set cover for the provided dataset.")
+        })?;
+    Ok((picks.into_iter().map(|p| (p.set, p.n_new)).collect(), owner))
+}
+
+/// Extract and validate the CSR pair so malformed offsets surface as
+/// `ValueError` here rather than a panic in the core slicing.
+fn csr_input(
+    offsets: &PyReadonlyArray1<'_, i64>,
+    elements: &PyReadonlyArray1<'_, i64>,
+) -> PyResult<(Vec<usize>, Vec<usize>)> {
+    let offsets = array_to_vec(offsets, "offsets")?;
+    let elements = array_to_vec(elements, "elements")?;
+
+    let well_formed = offsets.first() == Some(&0)
+        && offsets.last() == Some(&elements.len())
+        && offsets.windows(2).all(|w| w[0] <= w[1]);
+    if !well_formed {
+        return Err(PyValueError::new_err(
+            "offsets must start at 0, be non-decreasing, and end at len(elements)",
+        ));
+    }
+    Ok((offsets, elements))
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn _setcover_lib(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(greedy_set_cover_dense_py, m)?)?;
     m.add_function(wrap_pyfunction!(greedy_set_cover_dense_with_owner_py, m)?)?;
+    m.add_function(wrap_pyfunction!(greedy_set_cover_dense_csr_py, m)?)?;
+    m.add_function(wrap_pyfunction!(
+        greedy_set_cover_dense_csr_with_owner_py,
+        m
+    )?)?;
     Ok(())
 }
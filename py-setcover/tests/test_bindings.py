@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 import polars as pl
 import pytest
-from setcover import Step, map_to_ints, setcover
+from setcover import Step, map_to_ints, setcover, setcover_dense
 
 
 def test_map_to_ints_dense_ids_with_pandas():
@@ -258,3 +259,44 @@ def test_mapping_and_dataframe_paths_agree():
     assert [s.set for s in from_mapping] == _col(from_frame, "set")
     assert [s.n_new for s in from_mapping] == _col(from_frame, "n_new")
     assert [s.n_cum for s in from_mapping] == _col(from_frame, "n_cum")
+
+
+def test_dense_integer_ids_skip_the_rank_without_changing_the_answer():
+    # 0-based contiguous ids in both columns take the identity-cast fast path
+    # on the polars route; shifting them off zero forces the rank fallback.
+    # Same instance either way, so the covers must match pick for pick.
+    sets = {0: [0, 1, 2], 1: [2, 3], 2: [3, 4], 3: [4]}
+    rows = [(s, e) for s, els in sets.items() for e in els]
+    dense = pl.DataFrame({"s": [r[0] for r in rows], "e": [r[1] for r in rows]})
+    shifted = dense.with_columns(pl.col("s") + 7, pl.col("e") + 7)
+
+    # The fast path must pass the ids through unchanged.
+    mapped = map_to_ints(dense, "s", "e").to_native()
+    assert _col(mapped, "set_int") == _col(mapped, "set")
+    assert _col(mapped, "element_int") == _col(mapped, "element")
+
+    fast = setcover(dense, "s", "e")
+    slow = setcover(shifted, "s", "e")
+    assert _col(fast, "set") == [s - 7 for s in _col(slow, "set")]
+    assert _col(fast, "n_new") == _col(slow, "n_new")
+
+
+def test_setcover_dense_takes_pre_encoded_sets():
+    res = setcover_dense(4, [[0, 1, 2], [2, 3]])
+
+    assert res == [
+        Step(set=0, step=0, n_new=3, n_cum=3),
+        Step(set=1, step=1, n_new=1, n_cum=4),
+    ]
+
+
+def test_setcover_dense_accepts_csr_layout():
+    flat = np.array([0, 1, 2, 2, 3])
+    offsets = np.array([0, 3, 5])
+
+    assert setcover_dense(4, flat, offsets) == setcover_dense(4, [[0, 1, 2], [2, 3]])
+
+
+def test_setcover_dense_raises_when_universe_is_not_covered():
+    with pytest.raises(ValueError, match="Unable to find a set cover"):
+        setcover_dense(3, [[0], [1]])
@@ -13,6 +13,10 @@ from pathlib import Path
 import numpy as np
 import polars as pl
 
+# Bump whenever build_random_dataframe changes what it samples for a given
+# seed, so cached datasets from the old generator are not silently reused.
+GENERATOR_VERSION = 3
+
 
 def build_random_dataframe(
     n_sets: int,
@@ -21,9 +25,18 @@ def build_random_dataframe(
     seed: int,
 ) -> pl.DataFrame:
     rng = np.random.default_rng(seed)
-    set_ids = rng.integers(low=0, high=n_sets, size=n_rows, dtype=np.int64)
-    element_ids = rng.integers(low=0, high=n_elements, size=n_rows, dtype=np.int64)
-    return pl.DataFrame({"set": set_ids, "element": element_ids})
+    # One generator call fills both columns: `high` broadcasts across the last
+    # axis, so each column keeps its own exact range (no modulo bias) while the
+    # PRNG writes a single contiguous buffer. The ids comfortably fit narrow
+    # unsigned dtypes, which halves (set) or quarters (element) the bytes
+    # moved through every write, parse and group-by downstream.
+    buf = rng.integers(
+        low=0, high=[n_sets, n_elements], size=(n_rows, 2), dtype=np.uint32
+    )
+    el_dtype = pl.UInt16 if n_elements <= 2**16 else pl.UInt32
+    return pl.DataFrame({"set": buf[:, 0], "element": buf[:, 1]}).cast(
+        {"element": el_dtype}
+    )
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,15 +67,22 @@ def compute_signature(args: argparse.Namespace) -> str:
         "n_elements": args.n_elements,
         "n_rows": args.n_rows,
         "seed": args.seed,
+        "generator": GENERATOR_VERSION,
     }
     raw = json.dumps(payload, sort_keys=True).encode("utf-8")
-    return hashlib.sha256(raw).hexdigest()
+    # blake2b is the fastest stdlib hash on 64-bit hosts; 16 bytes is plenty
+    # for telling parameter sets apart.
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
 
 def signature_path(output: Path) -> Path:
     return output.with_suffix(output.suffix + ".sig")
 
 
+def ipc_path(output: Path) -> Path:
+    return output.with_suffix(".arrow")
+
+
 def cache_is_valid(output: Path, sig: str) -> bool:
     sig_file = signature_path(output)
     if not output.exists() or not sig_file.exists():
@@ -89,7 +109,14 @@ def main():
     )
     df = build_random_dataframe(args.n_sets, args.n_elements, args.n_rows, args.seed)
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    df.write_csv(args.output)
+    # sink_* goes through the streaming engine, which formats and writes
+    # chunks in parallel instead of single-threaded write_csv.
+    df.lazy().sink_csv(args.output)
+    # Arrow IPC sidecar for the Python readers: typed columns, no text
+    # reparse. The CSV stays the canonical copy because the R baseline reads
+    # it with fread. Same signature guard covers both files since they are
+    # written together.
+    df.lazy().sink_ipc(ipc_path(args.output), compression="lz4")
     sig_file.write_text(sig)
     print(f"Wrote dataset to {args.output} (signature: {sig[:10]}...)")
 